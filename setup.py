@@ -24,6 +24,7 @@ setup(name=pkg_name,
       url='http://github.com/matplotlib/mplfinance',
       platforms='Cross platform (Linux, Mac OSX, Windows)',
       install_requires=['matplotlib','pandas'],
+      extras_require={'numba': ['numba']},
       license="BSD-style",
       package_dir={'': pkg_location},
       packages=find_packages(where=pkg_location),
@@ -0,0 +1,157 @@
+"""
+Loop style numeric kernels, written so that numba can compile them.
+
+These are plain python functions, which (when numba is installed) `_utils`
+JIT compiles, via `_njit.jit_kernel()`, for large inputs.  For small inputs
+(or without numba), `_utils` uses its own NumPy implementations in place of
+`calculate_atr` and `combine_adjacent`, but calls the kernels that have no
+NumPy equivalent (`quantize_moves`, `pnf_subtract_and_combine` and
+`pnf_apply_reversal`) directly, as plain python.
+
+Optionally, they can also be compiled ahead of time, into the extension
+module `mplfinance._mpf_kernels`, which `_utils` then uses for inputs of
+any size, without needing numba at runtime.  This is an explicit build
+step (it is not part of setup.py, since `numba.pycc` is deprecated, and
+the resulting module is platform specific); with numba installed, run:
+
+    python -m mplfinance._kernels
+"""
+
+import numpy as np
+
+def calculate_atr(highs, lows, closes, atr_length):
+    """Kernel for `_utils._calculate_atr()`: arguments must be
+    contiguous float64 arrays, and atr_length already validated.
+    """
+    atr = 0.0
+    for i in range(len(highs)-atr_length, len(highs)):
+        close_prev = closes[i-1]
+        atr += max(abs(highs[i]-lows[i]), abs(highs[i]-close_prev), abs(lows[i]-close_prev))
+    return atr/atr_length
+
+def combine_adjacent(arr, signs):
+    """Kernel for `_utils.combine_adjacent()`: `arr` must be a non-empty
+    contiguous array, and `signs` its (zero filled) signs.
+    Returns (output, starts) arrays.
+    """
+    output = np.empty_like(arr)
+    starts = np.empty(len(arr), dtype=np.int64)
+    output[0] = arr[0]
+    starts[0] = 0
+    n = 1
+    for i in range(1, len(arr)):
+        if signs[i] == signs[i-1]:
+            output[n-1] += arr[i]
+        else:
+            output[n] = arr[i]
+            starts[n] = i
+            n += 1
+    return output[:n], starts[:n]
+
+def quantize_moves(closes, size):
+    """Kernel for `_utils._quantize_moves()`: for each close after the
+    first, the (signed) number of whole renko bricks, or point and figure
+    boxes, of `size` that the close has moved from the previously created
+    brick/box.  `closes` must be a contiguous float64 array of length at
+    least 1.
+    """
+    diffs = np.zeros(len(closes)-1, dtype=np.int64)
+    prev_close = closes[0]
+    for i in range(len(closes)-1):
+        moves = (closes[i+1] - prev_close) / size
+        if moves != moves:
+            raise ValueError('cannot convert float NaN to integer')
+        diff = int(moves)
+        if diff != 0:
+            diffs[i] = diff
+            prev_close += diff * size
+    return diffs
+
+def pnf_subtract_and_combine(boxes, volumes):
+    """Kernel for `_utils._pnf_adjust_columns()`: subtract 1 from the
+    absolute value of every column of boxes except the first, and then
+    combine adjacent like signed columns (ignoring columns that are now
+    zero, whose volumes are carried into the next column kept).
+    Returns (boxes, volumes, indexes) where indexes are the positions
+    in the input of the first column combined into each output column.
+    """
+    if len(boxes) == 0:
+        raise IndexError('list index out of range')
+    adjusted_boxes = np.empty(len(boxes), dtype=np.int64)
+    adjusted_volumes = np.empty_like(volumes)
+    indexes = np.empty(len(boxes), dtype=np.int64)
+    adjusted_boxes[0] = boxes[0]
+    adjusted_volumes[0] = volumes[0]
+    indexes[0] = 0
+    n = 1
+    volume_cache = 0
+    for i in range(1, len(boxes)):
+        adjusted_value = boxes[i] - ((boxes[i] >> 63) | 1) # (branch-free sign: boxes are never zero)
+        if adjusted_value != 0 and adjusted_boxes[n-1]*adjusted_value < 0:
+            adjusted_boxes[n] = adjusted_value
+            adjusted_volumes[n] = volumes[i] + volume_cache
+            indexes[n] = i
+            n += 1
+            volume_cache = 0
+        elif adjusted_value != 0 and adjusted_boxes[n-1]*adjusted_value > 0:
+            adjusted_boxes[n-1] += adjusted_value
+            adjusted_volumes[n-1] += volumes[i] + volume_cache
+            volume_cache = 0
+        else:
+            volume_cache += volumes[i]
+    return adjusted_boxes[:n], adjusted_volumes[:n], indexes[:n]
+
+def pnf_apply_reversal(adjusted_boxes, adjusted_volumes, reversal):
+    """Kernel for `_utils._pnf_adjust_columns()`: combine columns until
+    the change in the opposite direction is at least `reversal` boxes.
+    Returns (boxes, volumes, indexes) where indexes are the positions
+    in the input of the column that started each output column.
+    """
+    boxes = np.empty(len(adjusted_boxes), dtype=np.int64)
+    volumes = np.empty_like(adjusted_volumes)
+    indexes = np.empty(len(adjusted_boxes), dtype=np.int64)
+    boxes[0] = adjusted_boxes[0]
+    volumes[0] = adjusted_volumes[0]
+    indexes[0] = 0
+    n = 1
+    rolling_change = 0
+    volume_cache = 0
+    biggest_difference = 0 # only used for the last column
+    for i in range(1, len(adjusted_boxes)):
+        rolling_change += adjusted_boxes[i]
+        volume_cache += adjusted_volumes[i]
+        if rolling_change*boxes[n-1] > 0 and abs(rolling_change) > abs(biggest_difference):
+            biggest_difference = rolling_change
+        if abs(rolling_change) >= reversal:
+            if rolling_change*boxes[n-1] > 0:
+                boxes[n-1] += rolling_change
+                volumes[n-1] += volume_cache
+            else:
+                boxes[n] = rolling_change
+                volumes[n] = volume_cache
+                indexes[n] = i
+                n += 1
+            rolling_change = 0
+            volume_cache = 0
+            biggest_difference = 0
+    # Adjust the last column if the left over rolling_change is the same sign as the column
+    boxes[n-1] += biggest_difference
+    volumes[n-1] += volume_cache
+    return boxes[:n], volumes[:n], indexes[:n]
+
+def _aot_compiler():
+    """Return a `numba.pycc.CC` that compiles the above kernels into
+    the extension module `mplfinance._mpf_kernels` (requires numba).
+    """
+    from numba.pycc import CC
+    cc = CC('_mpf_kernels')
+    cc.export('calculate_atr','f8(f8[:],f8[:],f8[:],i8)')(calculate_atr)
+    cc.export('combine_adjacent','UniTuple(i8[:],2)(i8[:],i8[:])')(combine_adjacent)
+    cc.export('quantize_moves','i8[:](f8[:],f8)')(quantize_moves)
+    cc.export('pnf_subtract_and_combine','UniTuple(i8[:],3)(i8[:],i8[:])')(pnf_subtract_and_combine)
+    cc.export('pnf_apply_reversal','UniTuple(i8[:],3)(i8[:],i8[:],i8)')(pnf_apply_reversal)
+    return cc
+
+if __name__ == '__main__':
+    # Build the extension module in place, next to this file:
+    _aot_compiler().compile()
@@ -0,0 +1,43 @@
+"""
+Optional Numba support for mplfinance.
+
+numba is NOT imported when mplfinance is imported (that alone takes longer
+than most plots) but only the first time that `jit_kernel()` is asked for a
+kernel to process at least `JIT_MIN_SIZE` elements: below that size, even
+loading previously cached compiled kernels costs more than running the
+plain python or NumPy code, so callers should use that instead.
+
+If the kernels in `_kernels` were compiled ahead of time (an optional build
+step: see `_kernels`) then `aot_kernels` is that extension module, which
+does not need numba at runtime; otherwise None.
+"""
+
+# Size (number of elements) of the data below which numba is not used:
+JIT_MIN_SIZE = 250000
+
+_numba_njit = None   # numba.njit once imported; False if numba is not installed.
+_jitted     = {}     # compiled kernels, keyed by the (python) kernel function.
+
+def jit_kernel(kernel, size, **options):
+    """Return `kernel` compiled with `numba.njit(cache=True, **options)`, or
+    None if `size` is less than `JIT_MIN_SIZE` or numba is not installed.
+    """
+    global _numba_njit
+    if size < JIT_MIN_SIZE:
+        return None
+    if _numba_njit is None:
+        try:
+            from numba import njit
+            _numba_njit = njit
+        except ImportError:
+            _numba_njit = False
+    if not _numba_njit:
+        return None
+    if kernel not in _jitted:
+        _jitted[kernel] = _numba_njit(cache=True, **options)(kernel)
+    return _jitted[kernel]
+
+try:
+    from mplfinance import _mpf_kernels as aot_kernels
+except ImportError:
+    aot_kernels = None
@@ -6,17 +6,21 @@ import numpy  as np
 import pandas as pd
 import matplotlib.dates as mdates
 import datetime
+import functools
 
 from itertools import cycle
+from collections.abc import Hashable
 
 from matplotlib             import colors as mcolors
-from matplotlib.patches     import Ellipse
-from matplotlib.collections import LineCollection, PolyCollection, PatchCollection
+from matplotlib.path        import Path
+from matplotlib.collections import LineCollection, PolyCollection, PathCollection
 
 from mplfinance._arg_validators import _process_kwargs, _validate_vkwargs_dict
 from mplfinance._arg_validators import _alines_validator, _bypass_kwarg_validation
 from mplfinance._arg_validators import _xlim_validator, _is_datelike
 from mplfinance._styles         import _get_mpfstyle
+from mplfinance._njit           import jit_kernel, aot_kernels
+from mplfinance                 import _kernels
 
 from six.moves import zip
 
@@ -46,20 +50,17 @@ def _check_input(opens, closes, highs, lows):
     if not same_length:
         raise ValueError('O,H,L,C must have the same length!')
 
-    o = np.where(np.isnan(opens))[0]
-    h = np.where(np.isnan(highs))[0]
-    l = np.where(np.isnan(lows))[0]
-    c = np.where(np.isnan(closes))[0]
+    # One (4 x N) mask, instead of four separate isnan/where passes:
+    nanmask = np.isnan(np.asarray([opens,highs,lows,closes],dtype=float))
 
     # First check that they have the same number of NaN:
-    same_numnans = len(o) == len(h) == len(l) == len(c)
+    numnans = nanmask.sum(axis=1)
+    same_numnans = (numnans == numnans[0]).all()
     if not same_numnans:
         raise ValueError('O,H,L,C must have the same amount of missing data!')
 
-    same_missing = ((o == h).all() and
-                    (o == l).all() and
-                    (o == c).all()
-                   )
+    # Each bar must be either all NaN or NaN free:
+    same_missing = (nanmask.all(axis=0) | ~nanmask.any(axis=0)).all()
     if not same_missing:
         raise ValueError('O,H,L,C must have the same missing data!')
 
@@ -122,14 +123,25 @@ def _calculate_atr(atr_length, highs, lows, closes):
         raise ValueError("Specified atr_length may not be less than 1")
     elif atr_length >= len(closes):
         raise ValueError("Specified atr_length is larger than the length of the dataset: " + str(len(closes)))
-    atr = 0
-    for i in range(len(highs)-atr_length, len(highs)):
-        high = highs[i]
-        low = lows[i]
-        close_prev = closes[i-1]
-        tr = max(abs(high-low), abs(high-close_prev), abs(low-close_prev))
-        atr += tr
-    return atr/atr_length
+    if aot_kernels is not None:
+        calculate_atr = aot_kernels.calculate_atr
+    else:
+        calculate_atr = jit_kernel(_kernels.calculate_atr, atr_length, fastmath=True)
+    if calculate_atr is not None:
+        return calculate_atr(np.ascontiguousarray(highs, dtype=np.float64),
+                             np.ascontiguousarray(lows, dtype=np.float64),
+                             np.ascontiguousarray(closes, dtype=np.float64),
+                             atr_length)
+    highs      = np.asarray(highs, dtype=float)[-atr_length:]
+    lows       = np.asarray(lows, dtype=float)[-atr_length:]
+    prev_close = np.asarray(closes, dtype=float)[-atr_length-1:-1]
+    tr = np.maximum.reduce([np.abs(highs-lows), np.abs(highs-prev_close), np.abs(lows-prev_close)])
+    return tr.sum()/atr_length
+
+def _price_range(highs, lows, closes):
+    """Range of all prices (an upper bound for any average true range)."""
+    return (max(np.nanmax(highs), np.nanmax(closes)) -
+            min(np.nanmin(lows),  np.nanmin(closes)))
 
 def combine_adjacent(arr):
     """Sum like signed adjacent elements
@@ -140,21 +152,100 @@ def combine_adjacent(arr):
     output: new summed array
     indexes: indexes indicating the first 
              element summed for each group in arr
+
+    Zeros have no sign of their own: they are summed into the preceding
+    group (or, if at the start of arr, into the following group).
     """
-    output, indexes = [], []
-    curr_i = 0
-    while len(arr) > 0:
-        curr_sign = arr[0]/abs(arr[0])
-        index = 0
-        while index < len(arr) and arr[index]/abs(arr[index]) == curr_sign:
-            index += 1
-        output.append(sum(arr[:index]))
-        indexes.append(curr_i)
-        curr_i += index
-        
-        for _ in range(index):
-            arr.pop(0)
-    return output, indexes
+    arr = np.asarray(arr)
+    if len(arr) == 0:
+        return [], []
+    signs = _fill_zero_signs(np.sign(arr))
+    if aot_kernels is not None and arr.dtype == np.int64:
+        kernel = aot_kernels.combine_adjacent
+    else:
+        kernel = jit_kernel(_kernels.combine_adjacent, len(arr))
+    if kernel is not None:
+        output, starts = kernel(np.ascontiguousarray(arr),signs)
+        return output.tolist(), starts.tolist()
+    # each group starts wherever the sign differs from the previous element:
+    starts = np.concatenate(([0], np.flatnonzero(signs[1:] != signs[:-1]) + 1))
+    output = np.add.reduceat(arr, starts)
+    return output.tolist(), starts.tolist()
+
+def _fill_zero_signs(signs):
+    """Replace each zero in `signs` with the preceding non-zero sign, or
+    (for leading zeros) with the first non-zero sign.  Branchless: the
+    index of the last non-zero sign at or before each element is found
+    with a running maximum.
+    """
+    nonzero = signs != 0
+    if nonzero.all() or not nonzero.any():
+        return signs
+    last_nz = np.where(nonzero, np.arange(len(signs)), 0)
+    np.maximum.accumulate(last_nz, out=last_nz)
+    filled  = signs[last_nz]
+    first_nz = np.argmax(nonzero)
+    filled[:first_nz] = signs[first_nz]
+    return filled
+
+def _quantize_moves(closes, size):
+    """For each close after the first, the (signed) number of whole
+    renko bricks, or point and figure boxes, of `size` that the close
+    has moved from the previously created brick/box.
+
+    Returns
+    -------
+    diffs: int64 array, of length one less than closes
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    if aot_kernels is not None:
+        return aot_kernels.quantize_moves(closes, float(size))
+    # (there is no NumPy equivalent, so plain python if not JIT compiled:)
+    quantize_moves = jit_kernel(_kernels.quantize_moves, len(closes)) or _kernels.quantize_moves
+    return quantize_moves(closes, size)
+
+def _fold_skipped_volumes(volumes, active):
+    """Sum the volumes for the dates that were skipped (that have no
+    bricks/boxes) into the next active date (that has at least one).
+    Volumes for skipped dates after the last active date are dropped.
+    active : sorted indexes of the active dates
+
+    Returns
+    -------
+    volumes: array of volumes, one for each active date
+    """
+    volumes = np.asarray(volumes)
+    if len(active) == 0:
+        return volumes[:0]
+    starts = np.concatenate(([0], active[:-1]+1))
+    return np.add.reduceat(volumes[:active[-1]+1], starts)
+
+def _pnf_adjust_columns(boxes, volumes, reversal):
+    """Subtract one box from every point and figure column but the first
+    (to account for the reversal box) and combine like signed columns,
+    then combine columns until they reverse by at least `reversal` boxes.
+    boxes : (combined adjacent) column box counts
+    volumes : volume of each column
+
+    Returns
+    -------
+    boxes: new column box counts
+    volumes: new column volumes
+    indexes: index (into the input columns) of each new column's date
+    """
+    boxes   = np.ascontiguousarray(boxes, dtype=np.int64)
+    volumes = np.ascontiguousarray(volumes)
+    if aot_kernels is not None and volumes.dtype == np.int64:
+        subtract_and_combine = aot_kernels.pnf_subtract_and_combine
+        apply_reversal       = aot_kernels.pnf_apply_reversal
+    else:
+        subtract_and_combine = (jit_kernel(_kernels.pnf_subtract_and_combine, len(boxes)) or
+                                _kernels.pnf_subtract_and_combine)
+        apply_reversal       = (jit_kernel(_kernels.pnf_apply_reversal, len(boxes)) or
+                                _kernels.pnf_apply_reversal)
+    adjusted_boxes, adjusted_volumes, indexes = subtract_and_combine(boxes, volumes)
+    boxes, volumes, reversal_indexes = apply_reversal(adjusted_boxes, adjusted_volumes, reversal)
+    return boxes, volumes, indexes[reversal_indexes]
 
 def coalesce_volume_dates(in_volumes, in_dates, indexes):
     """Sums volumes between the indexes and ouputs
@@ -168,34 +259,60 @@ def coalesce_volume_dates(in_volumes, in_dates, indexes):
     volumes: new volume array
     dates: new dates array
     """
-    volumes, dates = [], []
-    for i in range(len(indexes)):
-        dates.append(in_dates[indexes[i]])
-        to_sum_to = indexes[i+1] if i+1 < len(indexes) else len(in_volumes)
-        volumes.append(sum(in_volumes[indexes[i]:to_sum_to]))
+    dates = [in_dates[i] for i in indexes]
+    if len(in_volumes) == 0 or len(indexes) == 0:
+        # no volume data: every group sums to zero
+        return [0]*len(indexes), dates
+    # reduceat sums each [indexes[i]:indexes[i+1]] segment, and the last one to the end:
+    volumes = np.add.reduceat(np.asarray(in_volumes), np.asarray(indexes)).tolist()
     return volumes, dates
 
 
 def _updown_colors(upcolor,downcolor,opens,closes,use_prev_close=False):
     if upcolor == downcolor:
         return upcolor
-    cmap = {True : upcolor, False : downcolor}
+    # row 0 is the down color, row 1 the up color, so an up/down
+    # boolean array can be used directly to index the table:
+    table  = mcolors.to_rgba_array([downcolor,upcolor])
+    opens  = np.asarray(opens)
+    closes = np.asarray(closes)
     if not use_prev_close:
-        return [ cmap[opn < cls] for opn,cls in zip(opens,closes) ]
+        return table[(opens < closes).view(np.uint8)]
     else:
-        first = cmap[opens[0] < closes[0]] 
-        _list = [ cmap[pre < cls] for cls,pre in zip(closes[1:], closes) ]
-        return [first] + _list
+        prev = np.empty_like(closes)
+        prev[0]  = opens[0]
+        prev[1:] = closes[:-1]
+        return table[(prev < closes).view(np.uint8)]
 
 
 def _updownhollow_colors(upcolor,downcolor,hollowcolor,opens,closes):
+    """Return the (body, edge) colors for hollow and filled candles.
+    The edge (and wick) colors are the same as
+    `_updown_colors(upcolor,downcolor,opens,closes,use_prev_close=True)`,
+    but are computed here from the same comparisons as the body colors.
+    """
     if upcolor == downcolor:
-        return upcolor
-    umap = {True : hollowcolor, False : upcolor  }
-    dmap = {True : hollowcolor, False : downcolor}
-    first = umap[closes[0] > opens[0]]
-    _list = [ umap[cls > opn] if cls > cls0 else dmap[cls > opn] for cls0,opn,cls in zip(closes[0:-1],opens[1:],closes[1:]) ]
-    return [first] + _list
+        return upcolor, upcolor
+    opens   = np.asarray(opens)
+    closes  = np.asarray(closes)
+    rising  = closes[1:] > closes[:-1]
+    bullish = closes > opens
+
+    # body: index = 2*(close > previous close) + (close > open), where
+    # bullish (close > open) candles are always hollow:
+    up_trend = np.empty(len(closes),dtype=bool)
+    up_trend[0]  = True   # the first candle has no previous close; treat as up.
+    up_trend[1:] = rising
+    table  = mcolors.to_rgba_array([downcolor,hollowcolor,upcolor,hollowcolor])
+    body   = table[up_trend.view(np.uint8)*2 + bullish.view(np.uint8)]
+
+    # edge: the first candle compares its open instead of a previous close:
+    up_prev_close = np.empty(len(closes),dtype=bool)
+    up_prev_close[0]  = bullish[0]
+    up_prev_close[1:] = rising
+    edge   = table[2*up_prev_close.view(np.uint8)]
+
+    return body, edge
 
 
 def _date_to_iloc(dtseries,date):
@@ -204,22 +321,57 @@ def _date_to_iloc(dtseries,date):
        If `date` is outside the range of dates in the series, then raise an exception
       .
     '''
-    d1s = dtseries.loc[date:]
-    if len(d1s) < 1:
-        sdtrange = str(dtseries[0])+' to '+str(dtseries[-1])
+    return _dates_to_ilocs(dtseries,[date])[0]
+
+def _timestamps_for_index(dtix,dates):
+    '''Convert `dates` to a DatetimeIndex that can be compared with (or searched in)
+       the DatetimeIndex `dtix`, matching its timezone awareness the same way that
+       `dtseries.loc[date:]` does.
+    '''
+    stamps = [pd.Timestamp(dt) for dt in dates]
+    if dtix.tz is not None:
+        stamps = [ts.tz_localize(dtix.tz) if ts.tz is None else ts.tz_convert(dtix.tz) for ts in stamps]
+    else:
+        stamps = [ts if ts.tz is None else ts.tz_convert(None) for ts in stamps]
+    return pd.DatetimeIndex(stamps)
+
+def _date_slice_bounds(dtix,dates):
+    '''Find, for each of `dates`, the same locations that `dtseries.loc[date:]` and
+       `dtseries.loc[:date]` would start and end at: loc1 is the first location at or
+       after the date, and loc2 the last location at or before the date.  If there are
+       duplicate dates in the series, for example in a renko plot, then these bracket
+       all of the duplicates.  Date strings are resolved the way `.loc` resolves them,
+       so that a partial date string (such as '2019-11-06' for intraday data) brackets
+       the whole period that it names.  All other dates are located with a single pair
+       of (vectorized) binary searches on the index.
+    '''
+    loc1 = np.empty(len(dates),dtype=int)
+    loc2 = np.empty(len(dates),dtype=int)
+    isstr = np.array([isinstance(dt,str) for dt in dates],dtype=bool)
+    for ix in np.flatnonzero(isstr):
+        loc1[ix] = dtix.get_slice_bound(dates[ix],side='left')
+        loc2[ix] = dtix.get_slice_bound(dates[ix],side='right') - 1
+    if not isstr.all():
+        stamps = _timestamps_for_index(dtix,[dt for dt,s in zip(dates,isstr) if not s])
+        loc1[~isstr] = dtix.searchsorted(stamps,side='left')
+        loc2[~isstr] = dtix.searchsorted(stamps,side='right') - 1
+    return loc1, loc2
+
+def _dates_to_ilocs(dtseries,dates):
+    '''Convert a sequence of `dates` to locations, given a date series w/a datetime index.
+       Same as calling `_date_to_iloc()` for each date, except that the dates are located
+       together (see `_date_slice_bounds()`).
+    '''
+    loc1, loc2 = _date_slice_bounds(dtseries.index,dates)
+    sdtrange = str(dtseries.iloc[0])+' to '+str(dtseries.iloc[-1])
+    beyond = np.flatnonzero(loc1 >= len(dtseries))
+    if len(beyond) > 0:
+        date = dates[beyond[0]]
         raise ValueError('User specified line date "'+str(date)+'" is beyond (greater than) range of plotted data ('+sdtrange+').')
-    d1 = d1s.index[0]
-    d2s = dtseries.loc[:date]
-    if len(d2s) < 1:
-        sdtrange = str(dtseries[0])+' to '+str(dtseries[-1])
+    before = np.flatnonzero(loc2 < 0)
+    if len(before) > 0:
+        date = dates[before[0]]
         raise ValueError('User specified line date "'+str(date)+'" is before (less than) range of plotted data ('+sdtrange+').')
-    d2 = dtseries.loc[:date].index[-1]
-    # If there are duplicate dates in the series, for example in a renko plot
-    # then .get_loc(date) will return a slice containing all the dups, so:
-    loc1 = dtseries.index.get_loc(d1)
-    if isinstance(loc1,slice): loc1 = loc1.start
-    loc2 = dtseries.index.get_loc(d2)
-    if isinstance(loc2,slice): loc2 = loc2.stop - 1
     return (loc1+loc2)/2.0
 
 def _date_to_iloc_linear(dtseries,date,trace=False):
@@ -229,12 +381,23 @@ def _date_to_iloc_linear(dtseries,date,trace=False):
            iloc = (slope)*(dtseries) + (yintercept)
        Then use them to calculate the location of `date`
     '''
-    d1 = _date_to_mdate(dtseries.index[0])
-    d2 = _date_to_mdate(dtseries.index[-1])
+    linear_params = _linear_iloc_params.__wrapped__ if trace else _linear_iloc_params
+    slope, yitrcpt = linear_params(dtseries.index[0],dtseries.index[-1],len(dtseries),trace)
+    return (slope * _date_to_mdate(date)) + yitrcpt
+
+@functools.lru_cache(maxsize=32)
+def _linear_iloc_params(first,last,length,trace=False):
+    '''Calculate the (slope, yintercept) used by `_date_to_iloc_linear()`
+       for a date series of `length` dates, from `first` to `last`.
+       These depend only on the endpoints and length of the series, so
+       they are cached rather than recalculated for every date.
+    '''
+    d1 = _date_to_mdate(first)
+    d2 = _date_to_mdate(last)
 
     if trace: print('d1,d2=',d1,d2)
     i1 = 0.0
-    i2 = len(dtseries) - 1.0
+    i2 = length - 1.0
     if trace: print('i1,i2=',i1,i2)
     
     slope   = (i2 - i1) / (d2 - d1)
@@ -247,7 +410,7 @@ def _date_to_iloc_linear(dtseries,date,trace=False):
         yitrcpt = (yitrcpt1 + yitrcpt2) / 2.0
     else:
         yitrcpt = yitrcpt1 
-    return (slope * _date_to_mdate(date)) + yitrcpt
+    return slope, yitrcpt
 
 def _date_to_iloc_5_7ths(dtseries,date,direction,trace=False):
         first = _date_to_mdate(dtseries.index[0])
@@ -283,8 +446,8 @@ def _date_to_iloc_extrapolate(dtseries,date):
        methods only for daily data.  For intraday data we use only method (1).
     '''
 
-    d1s = dtseries.loc[date:]
-    if len(d1s) < 1:
+    (loc1,), (loc2,) = _date_slice_bounds(dtseries.index,[date])
+    if loc1 >= len(dtseries):
         # extrapolate forward:
         loc_linear  = _date_to_iloc_linear(dtseries,date)
         loc_5_7ths  = _date_to_iloc_5_7ths(dtseries,date,'forward')
@@ -292,9 +455,7 @@ def _date_to_iloc_extrapolate(dtseries,date):
             return (loc_linear + loc_5_7ths)/2.0
         else:
             return loc_linear
-    d1 = d1s.index[0]
-    d2s = dtseries.loc[:date]
-    if len(d2s) < 1:
+    if loc2 < 0:
         # extrapolate backward:
         loc_linear = _date_to_iloc_linear(dtseries,date)
         loc_5_7ths = _date_to_iloc_5_7ths(dtseries,date,'backward')
@@ -303,17 +464,18 @@ def _date_to_iloc_extrapolate(dtseries,date):
         else:
             return loc_linear
     # Below here we *interpolate* (not extrapolate)
-    d2 = dtseries.loc[:date].index[-1]
-    # If there are duplicate dates in the series, for example in a renko plot
-    # then .get_loc(date) will return a slice containing all the dups, so:
-    loc1 = dtseries.index.get_loc(d1)
-    if isinstance(loc1,slice): loc1 = loc1.start
-    loc2 = dtseries.index.get_loc(d2)
-    if isinstance(loc2,slice): loc2 = loc2.stop - 1
     return (loc1+loc2)/2.0
 
 
 def _date_to_mdate(date):
+    if not isinstance(date,Hashable):
+        return None
+    return _date_to_mdate_cached(date)
+
+@functools.lru_cache(maxsize=4096)
+def _date_to_mdate_cached(date):
+    # The same dates (for example the endpoints of the plotted data when
+    # extrapolating) tend to be converted many times, so cache the results.
     if isinstance(date,str):
         pydt = pd.to_datetime(date).to_pydatetime()
     elif isinstance(date,pd.Timestamp):
@@ -335,15 +497,20 @@ def _convert_segment_dates(segments,dtindex):
     #import pdb
     #pdb.set_trace()
     if dtindex is not None:
+        # Locate all of the segment dates at once, rather than one at a time:
         dtseries = dtindex.to_series()
+        for line in segments:
+            for dt,value in line:
+                if not isinstance(dt,(str,pd.Timestamp,datetime.datetime,datetime.date)):
+                    raise TypeError('NON-DATE in segment line='+str(line))
+        ilocs = iter(_dates_to_ilocs(dtseries,[dt for line in segments for dt,value in line]))
+        return [ [(next(ilocs),value) for dt,value in line] for line in segments ]
+
     converted = []
     for line in segments:
         new_line = []
         for dt,value in line:
-            if dtindex is not None:
-                date = _date_to_iloc(dtseries,dt)  
-            else:
-                date = _date_to_mdate(dt)
+            date = _date_to_mdate(dt)
             if date is None:
                 raise TypeError('NON-DATE in segment line='+str(line))
             new_line.append((date,value))
@@ -447,6 +614,10 @@ def _valid_lines_kwargs():
 
     return vkwargs
 
+# The (validated) default lines kwargs, used whenever lines are not passed as a dict.
+# Callers may modify their config, so each caller makes its own (shallow) copy:
+_DEFAULT_LINES_KWARGS = _process_kwargs({}, _valid_lines_kwargs())
+
 
 def _construct_ohlc_collections(dates, opens, highs, lows, closes, marketcolors=None, config=None):
     """Represent the time, open, high, low, close as a vertical line
@@ -482,29 +653,43 @@ def _construct_ohlc_collections(dates, opens, highs, lows, closes, marketcolors=
     else:
         mktcolors = marketcolors['ohlc']
 
-    rangeSegments = [((dt, low), (dt, high)) for dt, low, high in zip(dates, lows, highs)]
+    dates = np.asarray(dates)
 
     datalen = len(dates)
 
+    # Segments are built as (N,2,2) ndarrays, which LineCollection accepts directly:
+    rangeSegments = np.empty((datalen,2,2))
+    rangeSegments[:,0,0] = dates
+    rangeSegments[:,0,1] = lows
+    rangeSegments[:,1,0] = dates
+    rangeSegments[:,1,1] = highs
+
     avg_dist_between_points = (dates[-1] - dates[0]) / float(datalen)
 
     ticksize = config['_width_config']['ohlc_ticksize']
 
     # the ticks will be from ticksize to 0 in points at the origin and
     # we'll translate these to the date, open location
-    openSegments = [((dt-ticksize, op), (dt, op)) for dt, op in zip(dates, opens)]
+    openSegments = np.empty((datalen,2,2))
+    openSegments[:,0,0] = dates - ticksize
+    openSegments[:,0,1] = opens
+    openSegments[:,1,0] = dates
+    openSegments[:,1,1] = opens
 
     # the ticks will be from 0 to ticksize in points at the origin and
     # we'll translate these to the date, close location
-    closeSegments = [((dt, close), (dt+ticksize, close)) for dt, close in zip(dates, closes)]
+    closeSegments = np.empty((datalen,2,2))
+    closeSegments[:,0,0] = dates
+    closeSegments[:,0,1] = closes
+    closeSegments[:,1,0] = dates + ticksize
+    closeSegments[:,1,1] = closes
 
     if mktcolors['up'] == mktcolors['down']:
         colors = mktcolors['up']
     else:
         colorup = mcolors.to_rgba(mktcolors['up'])
         colordown = mcolors.to_rgba(mktcolors['down'])
-        colord = {True: colorup, False: colordown}
-        colors = [colord[open < close] for open, close in zip(opens, closes)]
+        colors = _updown_colors(colorup, colordown, opens, closes)
 
     lw = config['_width_config']['ohlc_linewidth']
 
@@ -526,6 +711,38 @@ def _construct_ohlc_collections(dates, opens, highs, lows, closes, marketcolors=
     return [rangeCollection, openCollection, closeCollection]
 
 
+def _candle_verts_and_segments(dates, opens, highs, lows, closes, delta):
+    """Build the candle body vertices, shape (N,4,2), and the wick segments,
+    shape (2N,2,2), as ndarrays (which the matplotlib collections accept
+    directly) rather than as lists of tuples.  The first N wick segments
+    are the low wicks, and the remaining N are the high wicks.
+    """
+    dates  = np.asarray(dates)
+    opens  = np.asarray(opens)
+    closes = np.asarray(closes)
+    datalen = len(dates)
+
+    barVerts = np.empty((datalen,4,2))
+    barVerts[:,0,0] = barVerts[:,1,0] = dates - delta
+    barVerts[:,2,0] = barVerts[:,3,0] = dates + delta
+    barVerts[:,0,1] = barVerts[:,3,1] = opens
+    barVerts[:,1,1] = barVerts[:,2,1] = closes
+
+    lo = np.minimum(opens,closes)
+    hi = np.maximum(opens,closes)
+    rangeSegments = np.empty((2*datalen,2,2))
+    rangeSegments[:datalen,0,0] = dates
+    rangeSegments[:datalen,0,1] = lows
+    rangeSegments[:datalen,1,0] = dates
+    rangeSegments[:datalen,1,1] = lo
+    rangeSegments[datalen:,0,0] = dates
+    rangeSegments[datalen:,0,1] = highs
+    rangeSegments[datalen:,1,0] = dates
+    rangeSegments[datalen:,1,1] = hi
+
+    return barVerts, rangeSegments
+
+
 def _construct_candlestick_collections(dates, opens, highs, lows, closes, marketcolors=None, config=None):
     """Represent the open, close as a bar line and high low range as a
     vertical line.
@@ -566,33 +783,24 @@ def _construct_candlestick_collections(dates, opens, highs, lows, closes, market
 
     delta = config['_width_config']['candle_width'] / 2.0
 
-    barVerts = [((date - delta, open),
-                 (date - delta, close),
-                 (date + delta, close),
-                 (date + delta, open))
-                for date, open, close in zip(dates, opens, closes)]
-
-    rangeSegLow   = [((date, low), (date, min(open,close)))
-                     for date, low, open, close in zip(dates, lows, opens, closes)]
-    
-    rangeSegHigh  = [((date, high), (date, max(open,close)))
-                     for date, high, open, close in zip(dates, highs, opens, closes)]
-                      
-    rangeSegments = rangeSegLow + rangeSegHigh
+    barVerts, rangeSegments = _candle_verts_and_segments(dates, opens, highs, lows, closes, delta)
 
     alpha  = marketcolors['alpha']
 
     uc     = mcolors.to_rgba(marketcolors['candle'][ 'up' ], alpha)
     dc     = mcolors.to_rgba(marketcolors['candle']['down'], alpha)
-    colors = _updown_colors(uc, dc, opens, closes)
+    euc    = mcolors.to_rgba(marketcolors['edge'][ 'up' ], 1.0)
+    edc    = mcolors.to_rgba(marketcolors['edge']['down'], 1.0)
+    wuc    = mcolors.to_rgba(marketcolors['wick'][ 'up' ], 1.0)
+    wdc    = mcolors.to_rgba(marketcolors['wick']['down'], 1.0)
 
-    uc     = mcolors.to_rgba(marketcolors['edge'][ 'up' ], 1.0)
-    dc     = mcolors.to_rgba(marketcolors['edge']['down'], 1.0)
-    edgecolor = _updown_colors(uc, dc, opens, closes)
-    
-    uc     = mcolors.to_rgba(marketcolors['wick'][ 'up' ], 1.0)
-    dc     = mcolors.to_rgba(marketcolors['wick']['down'], 1.0)
-    wickcolor = _updown_colors(uc, dc, opens, closes)
+    if uc == dc and euc == edc and wuc == wdc:
+        # single color candles: no need to compare opens and closes at all.
+        colors, edgecolor, wickcolor = uc, euc, wuc
+    else:
+        colors    = _updown_colors(uc,  dc,  opens, closes)
+        edgecolor = _updown_colors(euc, edc, opens, closes)
+        wickcolor = _updown_colors(wuc, wdc, opens, closes)
 
     lw = config['_width_config']['candle_linewidth']
 
@@ -653,19 +861,7 @@ def _construct_hollow_candlestick_collections(dates, opens, highs, lows, closes,
 
     delta = config['_width_config']['candle_width'] / 2.0
 
-    barVerts = [((date - delta, open),
-                 (date - delta, close),
-                 (date + delta, close),
-                 (date + delta, open))
-                for date, open, close in zip(dates, opens, closes)]
-
-    rangeSegLow   = [((date, low), (date, min(open,close)))
-                     for date, low, open, close in zip(dates, lows, opens, closes)]
-    
-    rangeSegHigh  = [((date, high), (date, max(open,close)))
-                     for date, high, open, close in zip(dates, highs, opens, closes)]
-                      
-    rangeSegments = rangeSegLow + rangeSegHigh
+    barVerts, rangeSegments = _candle_verts_and_segments(dates, opens, highs, lows, closes, delta)
 
     alpha  = marketcolors['alpha']
 
@@ -674,11 +870,9 @@ def _construct_hollow_candlestick_collections(dates, opens, highs, lows, closes,
    
     hc = mcolors.to_rgba(marketcolors['hollow']) if 'hollow' in marketcolors else (0,0,0,0)
     
-    colors = _updownhollow_colors(uc, dc, hc, opens, closes)  # for candle body.
-
-    edgecolor = _updown_colors(uc, dc, opens, closes, use_prev_close=True)
-    
-    wickcolor = _updown_colors(uc, dc, opens, closes, use_prev_close=True)
+    # candle body colors, and edge colors (which are also the wick colors):
+    colors, edgecolor = _updownhollow_colors(uc, dc, hc, opens, closes)
+    wickcolor = edgecolor
 
     # For hollow candles, we scale the candle linewidth up a little:
     lw = 1.25 * config['_width_config']['candle_linewidth']
@@ -751,6 +945,11 @@ def _construct_renko_collections(dates, highs, lows, volumes, config_renko_param
     ret : list
         rectCollection
     """
+    # convert once, so that the reductions and arithmetic below run on typed arrays:
+    highs, lows, closes = [np.asarray(a, dtype=np.float64) for a in (highs, lows, closes)]
+    if volumes is not None:
+        volumes = np.asarray(volumes)
+
     renko_params = _process_kwargs(config_renko_params, _valid_renko_kwargs())
     if marketcolors is None:
         marketcolors = _get_mpfstyle('classic')['marketcolors']
@@ -766,12 +965,14 @@ def _construct_renko_collections(dates, highs, lows, volumes, config_renko_param
         else:
             brick_size = _calculate_atr(atr_length, highs, lows, closes)
     else: # is an integer or float
-        upper_limit = (max(closes) - min(closes)) / 2
-        lower_limit = 0.01 * _calculate_atr(len(closes)-1, highs, lows, closes)
+        upper_limit = (closes.max() - closes.min()) / 2
         if brick_size > upper_limit:
             raise ValueError("Specified brick_size may not be larger than (50% of the close price range of the dataset) which has value: "+ str(upper_limit))
-        elif brick_size < lower_limit:
-            raise ValueError("Specified brick_size may not be smaller than (0.01* the Average True Value of the dataset) which has value: "+ str(lower_limit))
+        # The ATR can not exceed the price range, so only calculate it if it might be needed:
+        elif brick_size < 0.01 * _price_range(highs, lows, closes):
+            lower_limit = 0.01 * _calculate_atr(len(closes)-1, highs, lows, closes)
+            if brick_size < lower_limit:
+                raise ValueError("Specified brick_size may not be smaller than (0.01* the Average True Value of the dataset) which has value: "+ str(lower_limit))
 
     alpha  = marketcolors['alpha']
 
@@ -780,75 +981,52 @@ def _construct_renko_collections(dates, highs, lows, volumes, config_renko_param
     euc    = mcolors.to_rgba(marketcolors['edge'][ 'up' ], 1.0)
     edc    = mcolors.to_rgba(marketcolors['edge']['down'], 1.0)
     
-    cdiff = [] # holds the differences between each close and the previously created brick / the brick size
-    prev_close_brick = closes[0]
-    volume_cache = 0 # holds the volumes for the dates that were skipped
-    new_dates = [] # holds the dates corresponding with the index
+    # brick_diffs holds the differences between each close and the previously created brick / the brick size
+    brick_diffs = _quantize_moves(closes, brick_size)
+    counts = np.abs(brick_diffs)
+
+    # A date with n bricks is repeated n times (and a date with none is dropped):
+    cdiff = np.repeat(np.sign(brick_diffs).astype(np.int8), counts)
+    new_dates = np.repeat(np.asarray(dates)[:-1], counts) # holds the dates corresponding with the index
     new_volumes = [] # holds the volumes corresponding with the index.  If more than one index for the same day then they all have the same volume.
 
-    for i in range(len(closes)-1):
-        brick_diff = int((closes[i+1] - prev_close_brick) / brick_size)
-        if brick_diff == 0:
-            if volumes is not None:
-                volume_cache += volumes[i]
-            continue
-
-        cdiff.extend([int(brick_diff/abs(brick_diff))] * abs(brick_diff))
-        if volumes is not None:
-            new_volumes.extend([volumes[i] + volume_cache] * abs(brick_diff))
-            volume_cache = 0
-        new_dates.extend([dates[i]] * abs(brick_diff))
-        prev_close_brick += brick_diff *brick_size
-
-    bricks = [] # holds bricks, -1 for down bricks, 1 for up bricks
+    # Every time there is a trend change one less brick is drawn,
+    # and the date for that brick is removed:
+    trend_change = np.zeros(len(cdiff), dtype=bool)
+    trend_change[1:] = cdiff[1:] != cdiff[:-1]
+    keep = ~trend_change
+    bricks = cdiff[keep] # holds bricks, -1 for down bricks, 1 for up bricks
+    new_dates = new_dates[keep].tolist()
     curr_price = closes[0]
 
-    last_diff_sign = 0 # direction the bricks were last going in -1 -> down, 1 -> up
-    dates_volumes_index = 0 # keeps track of the index of the current date/volume
-    for diff in cdiff:
-        
-        curr_diff_sign = diff/abs(diff)
-        if last_diff_sign != 0 and curr_diff_sign != last_diff_sign:
-            last_diff_sign = curr_diff_sign
-            new_dates.pop(dates_volumes_index)
-            if volumes is not None:
-                if dates_volumes_index == len(new_volumes)-1:
-                    new_volumes[dates_volumes_index-1] += new_volumes[dates_volumes_index]
-                else:
-                    new_volumes[dates_volumes_index+1] += new_volumes[dates_volumes_index]
-                new_volumes.pop(dates_volumes_index)
-            continue
-        last_diff_sign = curr_diff_sign
-    
-        if diff > 0:
-            bricks.extend([1]*abs(diff))
-        else:
-            bricks.extend([-1]*abs(diff))
-        dates_volumes_index += 1
-
-
-    verts = [] # holds the brick vertices
-    colors = [] # holds the facecolors for each brick
-    edge_colors = [] # holds the edgecolors for each brick
-    brick_values = [] # holds the brick values for each brick
-    for index, number in enumerate(bricks):
-        if number == 1: # up brick
-            colors.append(uc)
-            edge_colors.append(euc)
-        else: # down brick
-            colors.append(dc)
-            edge_colors.append(edc)
-
-        curr_price += (brick_size * number)
-        brick_values.append(curr_price)
-        
-        x, y = index, curr_price
-
-        verts.append((
-            (x, y),
-            (x, y+brick_size),
-            (x+1, y+brick_size),
-            (x+1, y)))
+    if volumes is not None:
+        active = np.flatnonzero(counts)
+        all_volumes = np.repeat(_fold_skipped_volumes(volumes, active), counts[active])
+        # The volume of a removed date is added to the next date that is kept
+        # (or, if no date after it is kept, to the last date that is kept):
+        kept, changes = np.flatnonzero(keep), np.flatnonzero(trend_change)
+        target = np.minimum(np.searchsorted(kept, changes), len(kept)-1)
+        kept_volumes = all_volumes[kept]
+        np.add.at(kept_volumes, target, all_volumes[changes])
+        new_volumes = kept_volumes.tolist()
+
+    # face and edge colors for each brick, looked up by: 0 -> down brick, 1 -> up brick
+    updown = (bricks > 0).view(np.uint8)
+    colors = np.array([dc,uc])[updown]
+    edge_colors = np.array([edc,euc])[updown]
+
+    # brick values (the bottom of each brick) are the running total of the bricks:
+    brick_values = np.cumsum(np.concatenate(([curr_price], float(brick_size) * bricks)))[1:]
+
+    # brick vertices, (x, y), (x, y+brick_size), (x+1, y+brick_size), (x+1, y):
+    x = np.arange(len(bricks))[:,np.newaxis]
+    y = brick_values[:,np.newaxis]
+    verts = np.empty((len(bricks),4,2))
+    verts[:,0:2,0] = x
+    verts[:,2:4,0] = x + 1
+    verts[:,(0,3),1] = y
+    verts[:,(1,2),1] = y + brick_size
+    brick_values = brick_values.tolist()
 
     useAA = 0,    # use tuple here
     lw = None
@@ -893,16 +1071,14 @@ def _construct_pointnfig_collections(dates, highs, lows, volumes, config_pointnf
     rolling_change and volume_cache to store and sum the changes that don't break 
     the reversal threshold.
 
-    Lastly, we enumerate through the boxes to populate the line_seg and circle_patches
-    arrays. line_seg holds the / and \ line segments that make up an X and 
-    circle_patches holds matplotlib.patches Ellipse objects for each O. We start
-    by filling an x and y array each iteration which contain the x and y 
-    coordinates for each box in the column. Then for each coordinate pair in
-    x, y we add to either the line_seg array or the circle_patches array 
-    depending on the value of sign for the current column (1 indicates 
-    line_seg, -1 indicates circle_patches). The height of the boxes take 
-    into account padding which separates each box by a small margin in 
-    order to increase readability.
+    Lastly, we expand the boxes into x and y arrays, which contain the x and y
+    coordinates of every box, to populate the line_seg and circle_paths arrays.
+    line_seg holds the / and \ line segments that make up an X and circle_paths
+    holds an ellipse path for each O. Each coordinate pair in x, y goes to
+    either the line_seg array or the circle_paths array depending on the sign
+    of its column (1 indicates line_seg, -1 indicates circle_paths). The height
+    of the boxes take into account padding which separates each box by a small
+    margin in order to increase readability.
 
     Useful sources:
     https://stackoverflow.com/questions/8750648/point-and-figure-chart-with-matplotlib
@@ -928,6 +1104,11 @@ def _construct_pointnfig_collections(dates, highs, lows, volumes, config_pointnf
     ret : tuple
         rectCollection
     """
+    # convert once, so that the reductions and arithmetic below run on typed arrays:
+    highs, lows, closes = [np.asarray(a, dtype=np.float64) for a in (highs, lows, closes)]
+    if volumes is not None:
+        volumes = np.asarray(volumes)
+
     pointnfig_params = _process_kwargs(config_pointnfig_params, _valid_pnf_kwargs())
     if marketcolors is None:
         marketcolors = _get_mpfstyle('classic')['marketcolors']
@@ -943,12 +1124,14 @@ def _construct_pointnfig_collections(dates, highs, lows, volumes, config_pointnf
         else:
             box_size = _calculate_atr(atr_length, highs, lows, closes)
     else: # is an integer or float
-        upper_limit = (max(closes) - min(closes)) / 2
-        lower_limit = 0.01 * _calculate_atr(len(closes)-1, highs, lows, closes)
+        upper_limit = (closes.max() - closes.min()) / 2
         if box_size > upper_limit:
             raise ValueError("Specified box_size may not be larger than (50% of the close price range of the dataset) which has value: "+ str(upper_limit))
-        elif box_size < lower_limit:
-            raise ValueError("Specified box_size may not be smaller than (0.01* the Average True Value of the dataset) which has value: "+ str(lower_limit))
+        # The ATR can not exceed the price range, so only calculate it if it might be needed:
+        elif box_size < 0.01 * _price_range(highs, lows, closes):
+            lower_limit = 0.01 * _calculate_atr(len(closes)-1, highs, lows, closes)
+            if box_size < lower_limit:
+                raise ValueError("Specified box_size may not be smaller than (0.01* the Average True Value of the dataset) which has value: "+ str(lower_limit))
 
     if reversal < 1 or reversal > 9:
         raise ValueError("Specified reversal must be an integer in the range [1,9]")
@@ -959,145 +1142,73 @@ def _construct_pointnfig_collections(dates, highs, lows, volumes, config_pointnf
     dc     = mcolors.to_rgba(marketcolors['ohlc']['down'], alpha)
     tfc    = mcolors.to_rgba(marketcolors['edge']['down'], 0) # transparent face color
 
-    boxes = [] # each element in an integer representing the number of boxes to be drawn on that indexes column (negative numbers -> Os, positive numbers -> Xs)
-    prev_close_box = closes[0] # represents the value of the last box in the previous column
-    volume_cache = 0 # holds the volumes for the dates that were skipped
-    temp_volumes, temp_dates = [], [] # holds the temp adjusted volumes and dates respectively
-    
-    for i in range(len(closes)-1):
-        box_diff = int((closes[i+1] - prev_close_box) / box_size)
-        if box_diff == 0:
-            if volumes is not None:
-                volume_cache += volumes[i]
-            continue
-
-        boxes.append(box_diff)
-        if volumes is not None:
-            temp_volumes.append(volumes[i] + volume_cache)
-            volume_cache = 0
-        temp_dates.append(dates[i])
-        prev_close_box += box_diff *box_size
+    # each element in boxes is an integer representing the number of boxes to be drawn on that indexes column (negative numbers -> Os, positive numbers -> Xs)
+    box_diffs = _quantize_moves(closes, box_size)
+    active = np.flatnonzero(box_diffs) # dates that were not skipped
+    boxes = box_diffs[active]
+    temp_dates = np.asarray(dates)[active].tolist()
+    temp_volumes = _fold_skipped_volumes(volumes, active).tolist() if volumes is not None else []
 
     # combine adjacent similarly signed differences
     boxes, indexes = combine_adjacent(boxes)
     new_volumes, new_dates = coalesce_volume_dates(temp_volumes, temp_dates, indexes)
-    
-    adjusted_boxes = [boxes[0]]
-    temp_volumes, temp_dates = [new_volumes[0]], [new_dates[0]]
-    volume_cache = 0
 
-    # Clean data to subtract 1 from all box # not including the first boxes element and combine like signed adjacent values (after ignoring zeros)
-    for i in range(1, len(boxes)):
-        adjusted_value = boxes[i]- int((boxes[i]/abs(boxes[i])))
-
-        # not equal to 0 and different signs
-        if adjusted_value != 0 and adjusted_boxes[-1]*adjusted_value < 0:
-
-            # Append adjusted_value, volumes, and date to associated lists
-            adjusted_boxes.append(adjusted_value)
-            temp_volumes.append(new_volumes[i] + volume_cache)
-            temp_dates.append(new_dates[i])
-
-            # reset volume_cache once we use it
-            volume_cache = 0
-
-        # not equal to 0 and same signs
-        elif adjusted_value != 0 and adjusted_boxes[-1]*adjusted_value > 0:
-
-            # Add adjusted_value and volume values to last added elements
-            adjusted_boxes[-1] += adjusted_value
-            temp_volumes[-1] += new_volumes[i] + volume_cache
-
-            # reset volume_cache once we use it
-            volume_cache = 0
-
-        else: # adjusted_value == 0
-            volume_cache += new_volumes[i]
-
-    boxes = [adjusted_boxes[0]]
-    new_volumes = [temp_volumes[0]]
-    new_dates = [temp_dates[0]]
-    
-    rolling_change = 0
-    volume_cache = 0
-    biggest_difference = 0 # only used for the last column
-
-    #Clean data to account for reversal size (added to allow overriding the default reversal of 1)
-    for i in range(1, len(adjusted_boxes)):
-
-        # Add to rolling_change and volume_cache which stores the box and volume values 
-        rolling_change += adjusted_boxes[i]
-        volume_cache += temp_volumes[i]
-
-        # if rolling_change is the same sign as the previous box and the abs value is bigger than the 
-        # abs value of biggest_difference then we should replace biggest_difference with rolling_change
-        if rolling_change*boxes[-1] > 0 and abs(rolling_change) > abs(biggest_difference):
-            biggest_difference = rolling_change
-
-        # Add to new list if the rolling change is >= the reversal
-        if abs(rolling_change) >= reversal:
-
-            # if rolling_change is the same sign as the previous # of boxes then combine
-            if rolling_change*boxes[-1] > 0:
-                boxes[-1] += rolling_change
-                new_volumes[-1] += volume_cache
-
-            # otherwise add new box
-            else: # < 0 (== 0 can't happen since neither rolling_change or boxes[-1] can be 0)
-                boxes.append(rolling_change)
-                new_volumes.append(volume_cache)
-                new_dates.append(temp_dates[i])
-            
-            # reset rolling_change and volume_cache once we've used them
-            rolling_change = 0
-            volume_cache = 0
-            
-            # reset biggest_difference as we start from the beginning every time there is a reversal
-            biggest_difference = 0
-    
-    # Adjust the last box column if the left over rolling_change is the same sign as the column
-    boxes[-1] += biggest_difference
-    new_volumes[-1] += volume_cache
-
-    curr_price = closes[0]
-    box_values = [] # y values for the boxes
-    circle_patches = [] # list of circle patches to be used to create the cirCollection
-    line_seg = [] # line segments that make up the Xs
-
-    for index, difference in enumerate(boxes):
-        diff = abs(difference)
-
-        sign = (difference / abs(difference)) # -1 or 1
-        start_iteration = 0 if sign > 0 else 1
-        
-        x = [index] * (diff)
-        y = [curr_price + (i * box_size * sign) for i in range(start_iteration, diff+start_iteration)]
-
-        curr_price += (box_size * sign * (diff))
-        box_values.append( y )
-        
-        for i in range(len(x)): # x and y have the same length
-            height = box_size * 0.85
-            width = 0.6
-            if height < 0.5:
-                width = height
-            
-            padding = (box_size * 0.075)
-            if sign == 1: # X
-                line_seg.append([(x[i]-width/2, y[i] + padding), (x[i]+width/2, y[i]+height + padding)]) # create / part of the X
-                line_seg.append([(x[i]-width/2, y[i]+height+padding), (x[i]+width/2, y[i]+padding)]) # create \ part of the X
-            else: # O
-                circle_patches.append(Ellipse((x[i], y[i]-(height/2) - padding), width, height))
+    # Subtract 1 from all box # not including the first boxes element and combine like signed
+    # adjacent values (after ignoring zeros), then account for the reversal size (added to allow
+    # overriding the default reversal of 1) using a rolling change that must reach the reversal:
+    boxes, new_volumes, date_indexes = _pnf_adjust_columns(boxes, new_volumes, reversal)
+    boxes = boxes.tolist()
+    new_volumes = new_volumes.tolist()
+    new_dates = [new_dates[i] for i in date_indexes]
+
+    # one (x, y) for each box, and whether it is an X (or an O):
+    boxes_arr = np.asarray(boxes, dtype=np.int64)
+    counts = np.abs(boxes_arr)
+    signs  = np.sign(boxes_arr).astype(np.float64) # -1 or 1
+    x = np.repeat(np.arange(len(boxes)), counts)
+    is_x = np.repeat(boxes_arr > 0, counts)
+
+    # the price before each column, and (for each box) its position in its column,
+    # counting from 0 for Xs (which are drawn above the price) but 1 for Os (below):
+    price_before = np.cumsum(np.concatenate(([closes[0]], box_size * signs * counts)))[:-1]
+    column_start = np.cumsum(counts) - counts
+    position = np.arange(len(x)) - np.repeat(column_start, counts) + (~is_x)
+    y = np.repeat(price_before, counts) + (position * box_size * np.repeat(signs, counts))
+    box_values = [column.tolist() for column in np.split(y, column_start[1:])] # y values for the boxes
+
+    height = box_size * 0.85
+    width = 0.6
+    if height < 0.5:
+        width = height
+    padding = (box_size * 0.075)
+
+    # line segments that make up the Xs, the / part then the \ part of each X:
+    xx, yx = x[is_x], y[is_x]
+    line_seg = np.empty((len(xx),2,2,2))
+    line_seg[:,:,0,0] = (xx - width/2)[:,np.newaxis]
+    line_seg[:,:,1,0] = (xx + width/2)[:,np.newaxis]
+    line_seg[:,0,0,1] = yx + padding
+    line_seg[:,0,1,1] = yx + height + padding
+    line_seg[:,1,0,1] = yx + height + padding
+    line_seg[:,1,1,1] = yx + padding
+    line_seg = line_seg.reshape(-1,2,2)
+
+    # ellipse paths to be used to create the cirCollection (the Os): every O is
+    # the same ellipse, so scale the unit circle once and then translate it:
+    circle = Path.unit_circle()
+    centers = np.column_stack((x[~is_x], y[~is_x]-(height/2) - padding))
+    ellipse = circle.vertices * (width*0.5, height*0.5)
+    circle_paths = [Path(verts, circle.codes) for verts in ellipse + centers[:,np.newaxis,:]]
     
     useAA = 0,    # use tuple here
     lw = 0.5        
 
-    cirCollection = PatchCollection(circle_patches)
-    cirCollection.set_facecolor([tfc] * len(circle_patches))
-    cirCollection.set_edgecolor([dc] * len(circle_patches))
+    cirCollection = PathCollection(circle_paths)
+    cirCollection.set_facecolor(np.broadcast_to(tfc, (len(circle_paths),4)))
+    cirCollection.set_edgecolor(np.broadcast_to(dc, (len(circle_paths),4)))
     
     xCollection = LineCollection(line_seg,
-                                 colors=[uc] * len(line_seg),
+                                 colors=np.broadcast_to(uc, (len(line_seg),4)),
                                  linewidths=lw,
                                  antialiaseds=useAA
                                  )
@@ -1142,7 +1253,7 @@ def _construct_aline_collections(alines, dtix=None):
         aconfig = _process_kwargs(alines, _valid_lines_kwargs())
         alines = aconfig['alines']
     else:
-        aconfig = _process_kwargs({}, _valid_lines_kwargs())
+        aconfig = dict(_DEFAULT_LINES_KWARGS)
 
     #print('aconfig=',aconfig)
     #print('alines=',alines)
@@ -1199,17 +1310,19 @@ def _construct_hline_collections(hlines,minx,maxx):
         hconfig = _process_kwargs(hlines, _valid_lines_kwargs())
         hlines = hconfig['hlines']
     else:
-        hconfig = _process_kwargs({}, _valid_lines_kwargs())
+        hconfig = dict(_DEFAULT_LINES_KWARGS)
 
     #print('hconfig=',hconfig)
     #print('hlines=',hlines)
     
-    lines = []
     if not isinstance(hlines,(list,tuple)):
         hlines = [hlines,] # may be a single price value
 
-    for val in hlines:
-        lines.append( [(minx,val),(maxx,val)] )
+    # each line is [(minx,val),(maxx,val)]
+    lines = np.empty((len(hlines),2,2))
+    lines[:,0,0] = minx
+    lines[:,1,0] = maxx
+    lines[:,:,1] = np.asarray(hlines,dtype=float)[:,np.newaxis]
 
     lw = hconfig['linewidths']
     co = hconfig['colors']
@@ -1262,7 +1375,7 @@ def _construct_vline_collections(vlines,dtix,miny,maxy):
         vconfig = _process_kwargs(vlines, _valid_lines_kwargs())
         vlines = vconfig['vlines']
     else:
-        vconfig = _process_kwargs({}, _valid_lines_kwargs())
+        vconfig = dict(_DEFAULT_LINES_KWARGS)
 
     #print('vconfig=',vconfig)
     #print('vlines=',vlines)
@@ -1318,7 +1431,7 @@ def _construct_tline_collections(tlines, dtix, dates, opens, highs, lows, closes
         tconfig = _process_kwargs(tlines, _valid_lines_kwargs())
         tlines  = tconfig['tlines']
     else:
-        tconfig = _process_kwargs({}, _valid_lines_kwargs())
+        tconfig = dict(_DEFAULT_LINES_KWARGS)
 
     tline_use    = tconfig['tline_use']
     tline_method = tconfig['tline_method']
@@ -1326,39 +1439,51 @@ def _construct_tline_collections(tlines, dtix, dates, opens, highs, lows, closes
     #print('tconfig=',tconfig)
     #print('tlines=',tlines)
 
-    # reconstruct the data frame:
-    df = pd.DataFrame({'open':opens,'high':highs,'low':lows,'close':closes},
-                      index=pd.DatetimeIndex(mdates.num2date(dates))   )
+    dates   = np.asarray(dates, dtype=float)
+    columns = dict(open=opens,high=highs,low=lows,close=closes)
 
     # possible `tvalue`s : close,open,high,low,oc_avg,hl_avg,ohlc_avg,hilo
     #          'hilo' means high on the up trend, low on the down trend.
     # possible `tmethod`s: point-to-point, leastsquares
 
-    def _tline_point_to_point(dfslice,tline_use):
-        p1 = dfslice.iloc[ 0]
-        p2 = dfslice.iloc[-1]
-        x1 = p1.name
-        y1 = p1[tline_use].mean()
-        x2 = p2.name
-        y2 = p2[tline_use].mean()
+    def _tline_values(lo,hi,tline_use):
+        # mean of the `tline_use` columns, ignoring NaNs, for each date in [lo:hi]
+        vals = np.column_stack([np.asarray(columns[u],dtype=float)[lo:hi] for u in tline_use])
+        nans = np.isnan(vals)
+        with np.errstate(invalid='ignore'):
+            return np.where(nans,0.0,vals).sum(axis=1) / (~nans).sum(axis=1)
+
+    def _tline_point_to_point(lo,hi,tline_use):
+        x1 = pd.Timestamp(mdates.num2date(dates[lo]))
+        y1 = _tline_values(lo,lo+1,tline_use)[0]
+        x2 = pd.Timestamp(mdates.num2date(dates[hi-1]))
+        y2 = _tline_values(hi-1,hi,tline_use)[0]
         return ((x1,y1),(x2,y2))
 
-    def _tline_lsq(dfslice,tline_use):
+    def _tline_lsq(lo,hi,tline_use):
         '''
-        This closed-form linear least squares algorithm was taken from:
-        https://mmas.github.io/least-squares-fitting-numpy-scipy
+        Closed-form linear least squares, on x values centered on their
+        mean: mdates are large numbers with a (relatively) small spread,
+        for which the uncentered normal equations lose precision.
         '''
-        si = dfslice[tline_use].mean(axis=1)
-        s  = si.dropna() 
-        if len(s) < 2:
+        si = _tline_values(lo,hi,tline_use)
+        notnan = ~np.isnan(si)
+        if np.count_nonzero(notnan) < 2:
             err = 'NOT enough data for Least Squares'
             if (len(si) > 2):
                 err += ', due to presence of NaNs'
             raise ValueError(err)
-        xs = mdates.date2num(s.index.to_pydatetime())
-        ys = s.values
-        a  = np.vstack([xs, np.ones(len(xs))]).T
-        m, b  = np.dot(np.linalg.inv(np.dot(a.T,a)), np.dot(a.T,ys))
+        xs = dates[lo:hi][notnan]
+        ys = si[notnan]
+        xm, ym = xs.mean(), ys.mean()
+        dx = xs - xm
+        sxx = np.dot(dx,dx)
+        if sxx > 0:
+            m = np.dot(dx,ys-ym) / sxx
+            b = ym - m*xm
+        else: # degenerate (all x values the same): let lstsq choose a solution
+            a = np.vstack([xs, np.ones(len(xs))]).T
+            m, b = np.linalg.lstsq(a, ys, rcond=None)[0]
         x1, x2 = xs[0], xs[-1]
         y1 = m*x1 + b
         y2 = m*x2 + b
@@ -1370,16 +1495,31 @@ def _construct_tline_collections(tlines, dtix, dates, opens, highs, lows, closes
     tline_use = [ u.lower() for u in tline_use ]
 
     alines = []
+    mdindex = None
     for d1,d2 in tlines:
-        dfslice = df.loc[d1:d2]
-        if len(dfslice) < 2:
-            dfdr = '\ndf date range: ['+str(df.index[0])+' , '+str(df.index[-1])+']'
+        # dates are sorted: find the [lo:hi] slice of dates from d1 through d2
+        md1, md2 = _date_to_mdate(d1), _date_to_mdate(d2)
+        if md1 is None or md2 is None:
+            raise TypeError('tlines date pair ('+str(d1)+','+str(d2)+') must be date[time]s')
+        if isinstance(d1,str) or isinstance(d2,str):
+            # A date string names a whole period (as in `df.loc[d1:d2]`), so slice
+            # through the end of that period, using the index's partial-string bounds:
+            if mdindex is None:
+                mdindex = pd.DatetimeIndex(mdates.num2date(dates))
+            loc1, loc2 = _date_slice_bounds(mdindex,[d1,d2])
+            lo, hi = loc1[0], loc2[1] + 1
+        else:
+            lo = np.searchsorted(dates, md1, side='left')
+            hi = np.searchsorted(dates, md2, side='right')
+        if hi - lo < 2:
+            dfdr = ('\ndf date range: ['+str(pd.Timestamp(mdates.num2date(dates[0])))+
+                    ' , '+str(pd.Timestamp(mdates.num2date(dates[-1])))+']')
             raise ValueError('\ntlines date pair ('+str(d1)+','+str(d2)+
                              ') too close, or wrong order, or out of range!'+dfdr)
         if tline_method == 'least squares' or tline_method == 'least-squares':
-            p1,p2 = _tline_lsq(dfslice,tline_use)
+            p1,p2 = _tline_lsq(lo,hi,tline_use)
         elif tline_method == 'point-to-point':
-            p1,p2 = _tline_point_to_point(dfslice,tline_use)
+            p1,p2 = _tline_point_to_point(lo,hi,tline_use)
         else:
             raise ValueError('\nUnrecognized value for `tline_method` = "'+str(tline_method)+'"')
 
@@ -1411,20 +1551,25 @@ class IntegerIndexDateTimeFormatter(Formatter):
         self.dates = dates
         self.len   = len(dates)
         self.fmt   = fmt
+        # formatted dates, by (index, fmt): matplotlib formats the same tick
+        # locations over and over again (for example, when panning or zooming)
+        self._cache = {}
 
     def __call__(self, x, pos=0):
         #import pdb; pdb.set_trace()
         'Return label for time x at position pos'
         # not sure what 'pos' is for: see
         # https://matplotlib.org/gallery/ticks_and_spines/date_index_formatter.html
-        ix = int(np.round(x))
+        ix = int(round(x))  # (same round-half-to-even as np.round)
          
         if ix >= self.len or ix < 0:
-            date = None
-            dateformat = ''
-        else:
+            return ''
+        key = (ix, self.fmt)
+        dateformat = self._cache.get(key)
+        if dateformat is None:
             date = self.dates[ix]
             dateformat = mdates.num2date(date).strftime(self.fmt)
+            self._cache[key] = dateformat
         #print('x=',x,'pos=',pos,'dates[',ix,']=',date,'dateformat=',dateformat)
         return dateformat
 
@@ -1434,13 +1579,23 @@ def _mscatter(x,y,ax=None, m=None, **kw):
     sc = ax.scatter(x,y,**kw)
     if (m is not None) and (len(m)==len(x)):
         paths = []
+        cache = {} # the same few markers are typically repeated many times
         for marker in m:
-            if isinstance(marker, mmarkers.MarkerStyle):
-                marker_obj = marker
-            else:
-                marker_obj = mmarkers.MarkerStyle(marker)
-            path = marker_obj.get_path().transformed(
-                        marker_obj.get_transform())
+            try:
+                path = cache.get(marker)
+            except TypeError: # unhashable marker
+                path = None
+            if path is None:
+                if isinstance(marker, mmarkers.MarkerStyle):
+                    marker_obj = marker
+                else:
+                    marker_obj = mmarkers.MarkerStyle(marker)
+                path = marker_obj.get_path().transformed(
+                            marker_obj.get_transform())
+                try:
+                    cache[marker] = path
+                except TypeError:
+                    pass
             paths.append(path)
         sc.set_paths(paths)
     return sc
@@ -528,7 +528,11 @@ def plot( data, **kwargs ):
         w  = config['_width_config']['volume_width']
         lw = config['_width_config']['volume_linewidth']
 
-        adjc =  _adjust_color_brightness(vcolors,0.90)
+        # Only two distinct colors, so adjust those and gather per bar, rather than
+        # adjusting the brightness of every bar's color individually (passed as a
+        # list, so that an rgb or rgba tuple is treated as a single color):
+        adjup, adjdown = _adjust_color_brightness([vup,vdown],0.90)
+        adjc = _updown_colors(adjup, adjdown, opens, closes, use_prev_close=style['marketcolors']['vcdopcod'])
         volumeAxes.bar(xdates,volumes,width=w,linewidth=lw,color=vcolors,ec=adjc)
         vymin = 0.3 * np.nanmin(volumes)
         vymax = 1.1 * np.nanmax(volumes)
@@ -0,0 +1,57 @@
+import os
+import pandas            as pd
+import mplfinance        as mpf
+import matplotlib.pyplot as plt
+from   matplotlib.collections import LineCollection
+
+print('mpf.__version__ =',mpf.__version__)                 # for the record
+print("plt.rcParams['backend'] =",plt.rcParams['backend']) # for the record
+
+infile = os.path.join('examples','data','SP500_NOV2019_IDayRVol.csv')
+idf = pd.read_csv(infile,index_col=0,parse_dates=True)
+
+def _line_xdata(ax):
+    # the lines are added after the price collections:
+    lc = ax.collections[-1]
+    assert isinstance(lc,LineCollection)
+    return [seg[:,0].tolist() for seg in lc.get_segments()]
+
+def test_intraday_alines_partial_date_string():
+    # A date string names the whole day, so (as for `idf.loc['2019-11-06']`)
+    # the line is placed in the middle of all of that day's intraday bars:
+    day  = idf.index.get_loc(idf.loc['2019-11-06'].index[0])
+    mid  = (day + day + len(idf.loc['2019-11-06']) - 1)/2.0
+    assert mid == 586.0
+    fig, axlist = mpf.plot(idf,type='candle',alines=[('2019-11-06',3100),(idf.index[-1],3080)],returnfig=True)
+    assert _line_xdata(axlist[0]) == [[mid,len(idf)-1]]
+    plt.close(fig)
+
+def test_intraday_date_to_iloc_partial_date_string():
+    from mplfinance._utils import _date_to_iloc
+    dtseries = idf.index.to_series()
+    assert _date_to_iloc(dtseries,'2019-11-06') == 586.0
+    # the whole month brackets all of the data:
+    assert _date_to_iloc(dtseries,'2019-11') == (len(idf)-1)/2.0
+    # a timestamp is still located exactly:
+    assert _date_to_iloc(dtseries,idf.index[10]) == 10.0
+    fig, axlist = mpf.plot(idf,type='candle',vlines='2019-11-06',returnfig=True)
+    assert _line_xdata(axlist[0]) == [[586.0,586.0]]
+    plt.close(fig)
+
+def test_intraday_xlim_partial_date_strings():
+    from mplfinance._utils import _date_to_iloc_extrapolate
+    dtseries = idf.index.to_series()
+    xlim = [_date_to_iloc_extrapolate(dtseries,dt) for dt in ('2019-11-06','2019-11-07')]
+    assert xlim == [586.0,977.0]
+    # dates beyond the data are still extrapolated:
+    assert _date_to_iloc_extrapolate(dtseries,'2019-11-20') > len(idf)-1
+    assert _date_to_iloc_extrapolate(dtseries,'2019-11-01') < 0
+
+def test_intraday_tlines_partial_date_strings():
+    # As for `idf.loc['2019-11-05':'2019-11-06']`, the trend line runs
+    # through the *end* of the last day, not to the start of it:
+    end = len(idf.loc[:'2019-11-06']) - 1
+    assert end == 781
+    fig, axlist = mpf.plot(idf,type='candle',tlines=[('2019-11-05','2019-11-06')],returnfig=True)
+    assert _line_xdata(axlist[0]) == [[0.0,end]]
+    plt.close(fig)
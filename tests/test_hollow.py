@@ -0,0 +1,60 @@
+import numpy             as np
+import pytest
+import mplfinance        as mpf
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+from   mplfinance._utils import _updownhollow_colors
+
+print('mpf.__version__ =',mpf.__version__)                 # for the record
+print("plt.rcParams['backend'] =",plt.rcParams['backend']) # for the record
+
+UC, DC, HC = (0,1,0,1), (1,0,0,1), (0,0,0,0)
+
+def _updown_reference(upcolor,downcolor,opens,closes):
+    '''The edge and wick colors, as originally mapped (with use_prev_close=True).'''
+    if upcolor == downcolor:
+        return upcolor
+    cmap = {True : upcolor, False : downcolor}
+    first = cmap[opens[0] < closes[0]]
+    _list = [ cmap[pre < cls] for cls,pre in zip(closes[1:], closes) ]
+    return [first] + _list
+
+def _updownhollow_reference(upcolor,downcolor,hollowcolor,opens,closes):
+    '''The body colors, as originally mapped.'''
+    if upcolor == downcolor:
+        return upcolor
+    umap = {True : hollowcolor, False : upcolor  }
+    dmap = {True : hollowcolor, False : downcolor}
+    first = umap[closes[0] > opens[0]]
+    _list = [ umap[cls > opn] if cls > cls0 else dmap[cls > opn] for cls0,opn,cls in zip(closes[0:-1],opens[1:],closes[1:]) ]
+    return [first] + _list
+
+# every combination of: close up/down/equal vs. open, and vs. the previous close:
+OPENS  = [10, 11, 12, 12, 11, 11, 11, 12, 12, 12]
+CLOSES = [11, 12, 12, 11, 11, 12, 11, 11, 12, 13]
+
+@pytest.mark.parametrize('opens,closes',[(OPENS,CLOSES),(CLOSES,OPENS),([10],[11]),([11],[10])])
+def test_updownhollow_colors(opens,closes):
+    body, edge = _updownhollow_colors(UC,DC,HC,np.array(opens,dtype=float),np.array(closes,dtype=float))
+    assert np.array_equal(body, mcolors.to_rgba_array(_updownhollow_reference(UC,DC,HC,opens,closes)))
+    assert np.array_equal(edge, mcolors.to_rgba_array(_updown_reference(UC,DC,opens,closes)))
+
+def test_updownhollow_colors_same_updown():
+    body, edge = _updownhollow_colors(UC,UC,HC,np.array(OPENS),np.array(CLOSES))
+    assert body == UC and edge == UC
+
+def test_hollow_and_filled_collections(bolldata):
+    df = bolldata
+    mc = mpf.make_marketcolors(up='g',down='r',inherit=True)
+    s  = mpf.make_mpf_style(base_mpf_style='classic',marketcolors=mc)
+    fig, axlist = mpf.plot(df,type='hollow_and_filled',style=s,returnfig=True)
+    wicks, bodies = axlist[0].collections[:2]
+    alpha  = s['marketcolors']['alpha']
+    uc, dc = mcolors.to_rgba('g',alpha), mcolors.to_rgba('r',alpha)
+    hc = mcolors.to_rgba(s['marketcolors']['hollow']) if 'hollow' in s['marketcolors'] else (0,0,0,0)
+    opens, closes = df['Open'].values, df['Close'].values
+    edge = mcolors.to_rgba_array(_updown_reference(uc,dc,opens,closes))
+    assert np.allclose(bodies.get_facecolors(), mcolors.to_rgba_array(_updownhollow_reference(uc,dc,hc,opens,closes)))
+    assert np.allclose(bodies.get_edgecolors(), edge)
+    assert np.allclose(wicks.get_colors(), edge)
+    plt.close(fig)
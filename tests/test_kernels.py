@@ -0,0 +1,183 @@
+import sys
+import numpy  as np
+import pytest
+import mplfinance        as mpf
+import mplfinance._njit  as _njit
+import mplfinance._utils as _utils
+from   mplfinance._styles import _get_mpfstyle
+
+print('mpf.__version__ =',mpf.__version__)                 # for the record
+
+# The kernels are run as plain python for small inputs, JIT compiled by numba
+# for large ones (if numba is installed), or compiled ahead of time (if built).
+# Test each path (forcing the JIT path with a small JIT_MIN_SIZE), and that the
+# plain python path is used for any size when numba cannot be imported:
+@pytest.fixture(params=['python','numba','no-numba','aot'])
+def kernels(request, monkeypatch):
+    monkeypatch.setattr(_utils, 'aot_kernels', None)
+    monkeypatch.setattr(_njit, '_jitted', {})
+    if request.param == 'numba':
+        pytest.importorskip('numba')
+        monkeypatch.setattr(_njit, 'JIT_MIN_SIZE', 0)
+    elif request.param == 'no-numba':
+        monkeypatch.setitem(sys.modules, 'numba', None)
+        monkeypatch.setattr(_njit, '_numba_njit', None)
+        monkeypatch.setattr(_njit, 'JIT_MIN_SIZE', 0)
+    elif request.param == 'aot':
+        # (built with `python -m mplfinance._kernels`)
+        aot_kernels = pytest.importorskip('mplfinance._mpf_kernels')
+        monkeypatch.setattr(_utils, 'aot_kernels', aot_kernels)
+    yield request.param
+    if request.param == 'numba':
+        assert len(_njit._jitted) > 0
+    else:
+        assert len(_njit._jitted) == 0
+    if request.param == 'no-numba':
+        assert _njit._numba_njit is False
+
+def _pnf_reference(closes, volumes, dates, box_size, reversal):
+    '''The point and figure columns, as calculated by the original python loops.'''
+    boxes = []
+    prev_close_box = closes[0]
+    volume_cache = 0
+    temp_volumes, temp_dates = [], []
+    for i in range(len(closes)-1):
+        box_diff = int((closes[i+1] - prev_close_box) / box_size)
+        if box_diff == 0:
+            if volumes is not None:
+                volume_cache += volumes[i]
+            continue
+        boxes.append(box_diff)
+        if volumes is not None:
+            temp_volumes.append(volumes[i] + volume_cache)
+            volume_cache = 0
+        temp_dates.append(dates[i])
+        prev_close_box += box_diff *box_size
+
+    boxes, indexes = _combine_adjacent_reference(boxes)
+    new_dates = [temp_dates[i] for i in indexes]
+    if len(temp_volumes) == 0:
+        new_volumes = [0]*len(indexes)
+    else:
+        new_volumes = [sum(temp_volumes[i:j]) for i,j in zip(indexes,indexes[1:]+[len(temp_volumes)])]
+
+    adjusted_boxes = [boxes[0]]
+    temp_volumes, temp_dates = [new_volumes[0]], [new_dates[0]]
+    volume_cache = 0
+    for i in range(1, len(boxes)):
+        adjusted_value = boxes[i]- int((boxes[i]/abs(boxes[i])))
+        if adjusted_value != 0 and adjusted_boxes[-1]*adjusted_value < 0:
+            adjusted_boxes.append(adjusted_value)
+            temp_volumes.append(new_volumes[i] + volume_cache)
+            temp_dates.append(new_dates[i])
+            volume_cache = 0
+        elif adjusted_value != 0 and adjusted_boxes[-1]*adjusted_value > 0:
+            adjusted_boxes[-1] += adjusted_value
+            temp_volumes[-1] += new_volumes[i] + volume_cache
+            volume_cache = 0
+        else:
+            volume_cache += new_volumes[i]
+
+    boxes = [adjusted_boxes[0]]
+    new_volumes = [temp_volumes[0]]
+    new_dates = [temp_dates[0]]
+    rolling_change = 0
+    volume_cache = 0
+    biggest_difference = 0
+    for i in range(1, len(adjusted_boxes)):
+        rolling_change += adjusted_boxes[i]
+        volume_cache += temp_volumes[i]
+        if rolling_change*boxes[-1] > 0 and abs(rolling_change) > abs(biggest_difference):
+            biggest_difference = rolling_change
+        if abs(rolling_change) >= reversal:
+            if rolling_change*boxes[-1] > 0:
+                boxes[-1] += rolling_change
+                new_volumes[-1] += volume_cache
+            else:
+                boxes.append(rolling_change)
+                new_volumes.append(volume_cache)
+                new_dates.append(temp_dates[i])
+            rolling_change = 0
+            volume_cache = 0
+            biggest_difference = 0
+    boxes[-1] += biggest_difference
+    new_volumes[-1] += volume_cache
+    return boxes, new_volumes, new_dates
+
+def _combine_adjacent_reference(arr):
+    '''`combine_adjacent()` as originally written (for input without zeros).'''
+    arr = list(arr)
+    output, indexes = [], []
+    curr_i = 0
+    while len(arr) > 0:
+        curr_sign = arr[0]/abs(arr[0])
+        index = 0
+        while index < len(arr) and arr[index]/abs(arr[index]) == curr_sign:
+            index += 1
+        output.append(sum(arr[:index]))
+        indexes.append(curr_i)
+        curr_i += index
+        for _ in range(index):
+            arr.pop(0)
+    return output, indexes
+
+def _pnf(closes, volumes, box_size, reversal):
+    closes = np.asarray(closes, dtype=float)
+    dates  = list(range(len(closes)))
+    params = dict(box_size=box_size, atr_length=14, reversal=reversal)
+    _, calculated_values = _utils._construct_pointnfig_collections(
+        dates, closes+0.5, closes-0.5, volumes, params, closes,
+        marketcolors=_get_mpfstyle('classic')['marketcolors'])
+    return calculated_values
+
+def _random_walk(n, seed):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+@pytest.mark.parametrize('reversal',[1,2,3])
+@pytest.mark.parametrize('voltype',[int,float,None])
+def test_pnf_columns(kernels, bolldata, reversal, voltype):
+    for closes in (bolldata['Close'].values, _random_walk(2000,seed=reversal)):
+        volumes = None
+        if voltype is not None:
+            volumes = np.random.default_rng(7).integers(1000, 100000, len(closes)).astype(voltype)
+        box_size = (closes.max() - closes.min()) / 40
+        boxes, new_volumes, new_dates = _pnf_reference(closes, volumes, list(range(len(closes))), box_size, reversal)
+        cv = _pnf(closes, volumes, box_size, reversal)
+        assert cv['counts']  == boxes
+        assert cv['dates']   == new_dates
+        assert cv['volumes'] == pytest.approx(new_volumes)
+
+def test_pnf_adjust_columns_empty(kernels):
+    # As with the original loops, there must be at least one column:
+    with pytest.raises(IndexError):
+        _utils._pnf_adjust_columns([], [], 1)
+
+def test_quantize_moves(kernels):
+    closes = _random_walk(500,seed=0)
+    diffs  = _utils._quantize_moves(closes, 0.75)
+    prev_close, expected = closes[0], []
+    for close in closes[1:]:
+        diff = int((close - prev_close) / 0.75)
+        expected.append(diff)
+        prev_close += diff * 0.75
+    assert diffs.tolist() == expected
+
+def test_quantize_moves_nan(kernels):
+    closes = _random_walk(50,seed=0)
+    closes[20] = np.nan
+    with pytest.raises(ValueError):
+        _utils._quantize_moves(closes, 0.75)
+    with pytest.raises(ValueError):
+        _pnf(closes, None, 1.0, 1)
+
+def test_combine_adjacent(kernels):
+    arr = np.random.default_rng(3).integers(1, 5, 1000) * np.random.default_rng(4).choice([-1,1], 1000)
+    assert _utils.combine_adjacent(arr) == _combine_adjacent_reference(arr)
+    assert _utils.combine_adjacent([]) == ([], [])
+
+def test_combine_adjacent_zeros(kernels):
+    # zeros are summed into the preceding group, or (leading zeros) into the following group:
+    assert _utils.combine_adjacent([0,0,2,3,-1]) == ([5,-1], [0,4])
+    assert _utils.combine_adjacent([2,0,3,-1,0,-2,4]) == ([5,-3,4], [0,3,6])
+    assert _utils.combine_adjacent([1.5,0.0,-2.5]) == ([1.5,-2.5], [0,2])
+    assert _utils.combine_adjacent([0,0,0]) == ([0], [0])
@@ -0,0 +1,40 @@
+import os
+import numpy             as np
+import pandas            as pd
+import pytest
+import mplfinance        as mpf
+import matplotlib.dates  as mdates
+from   mplfinance._utils import _construct_tline_collections
+
+print('mpf.__version__ =',mpf.__version__)                 # for the record
+
+infile = os.path.join('examples','data','SP500_NOV2019_IDayRVol.csv')
+idf = pd.read_csv(infile,index_col=0,parse_dates=True)
+
+def _lsq_endpoints(df,d1,d2,tline_use='close'):
+    dates = mdates.date2num(df.index.to_pydatetime())
+    lc = _construct_tline_collections(dict(tlines=[(d1,d2)],tline_method='least-squares',tline_use=tline_use),
+                                      None, dates, df['Open'].values, df['High'].values,
+                                      df['Low'].values, df['Close'].values)
+    return lc.get_segments()[0]
+
+def _polyfit_endpoints(df,d1,d2,ys):
+    xs = mdates.date2num(df.loc[d1:d2].index.to_pydatetime())
+    m, b = np.polyfit(xs,ys,1)
+    return np.array([[xs[0],m*xs[0]+b],[xs[-1],m*xs[-1]+b]])
+
+@pytest.mark.parametrize('d1,d2',[('2011-07-15','2011-12-20'),
+                                  (pd.Timestamp('2012-01-03'),pd.Timestamp('2012-06-29'))])
+def test_tline_least_squares_daily(bolldata,d1,d2):
+    expected = _polyfit_endpoints(bolldata,d1,d2,bolldata.loc[d1:d2,'Close'].values)
+    assert _lsq_endpoints(bolldata,d1,d2) == pytest.approx(expected,abs=1e-6)
+
+@pytest.mark.parametrize('d1,d2',[('2019-11-05 10:00','2019-11-06 15:00'),
+                                  ('2019-11-06','2019-11-07')])
+def test_tline_least_squares_intraday(d1,d2):
+    expected = _polyfit_endpoints(idf,d1,d2,idf.loc[d1:d2,'Close'].values)
+    assert _lsq_endpoints(idf,d1,d2) == pytest.approx(expected,abs=1e-6)
+    # and for the mean of more than one column:
+    hl_avg   = idf.loc[d1:d2,['High','Low']].mean(axis=1).values
+    expected = _polyfit_endpoints(idf,d1,d2,hl_avg)
+    assert _lsq_endpoints(idf,d1,d2,tline_use=['high','low']) == pytest.approx(expected,abs=1e-6)
@@ -0,0 +1,29 @@
+import numpy             as np
+import mplfinance        as mpf
+import matplotlib.pyplot as plt
+
+print('mpf.__version__ =',mpf.__version__)                 # for the record
+print("plt.rcParams['backend'] =",plt.rcParams['backend']) # for the record
+
+def test_volume_tuple_colors(bolldata):
+
+    df = bolldata
+
+    vup, vdown = (0,.6,0,1), (.8,.1,.1,1)
+    mc = mpf.make_marketcolors(base_mpf_style='classic',volume=dict(up=vup,down=vdown))
+    s  = mpf.make_mpf_style(base_mpf_style='classic',marketcolors=mc)
+    fig, axlist = mpf.plot(df,volume=True,style=s,returnfig=True)
+
+    bars = axlist[2].patches
+    assert len(bars) == len(df)
+    up   = (df['Close'] > df['Open']).values
+    fcs  = np.array([bar.get_facecolor() for bar in bars])
+    assert np.allclose(fcs[ up],vup)
+    assert np.allclose(fcs[~up],vdown)
+
+    # edges are the same colors, slightly darker:
+    ecs  = np.array([bar.get_edgecolor() for bar in bars])
+    assert np.all(ecs[ up,:3] <= vup[:3])
+    assert np.all(ecs[~up,:3] <= vdown[:3])
+    assert not np.allclose(ecs[up,:3],vup[:3])
+    plt.close(fig)